@@ -14,6 +14,7 @@ Run with nix develop -c python3 references/mappings/generate-maps.py --out src/c
 from __future__ import annotations
 
 import argparse
+import io
 import re
 import sys
 from dataclasses import dataclass
@@ -97,25 +98,26 @@ _PC_OEM_CONTROL_GLYPHS: dict[int, int] = {
     0x7F: 0x2302,
 }
 
+# _PC_OEM_CONTROL_GLYPHS as a byte-indexed list; -1 means "no override".
+_PC_OEM_OVERRIDE: list[int] = [_PC_OEM_CONTROL_GLYPHS.get(b, -1) for b in range(256)]
+
 
 def table_for(py_codec: str) -> list[int]:
-    out = []
-    for b in range(256):
-        # Some OEM codepages have undefined bytes in Python's mapping tables (e.g. cp857).
-        # Use replacement so generation is total and deterministic.
-        # Only apply the PC OEM control-glyph convention to DOS/OEM "cp*" encodings.
-        # Do NOT apply it to ISO-8859-* style encodings (e.g. latin-1 for Amiga).
-        if py_codec.startswith("cp") and b in _PC_OEM_CONTROL_GLYPHS:
-            out.append(_PC_OEM_CONTROL_GLYPHS[b])
-            continue
+    # Some OEM codepages have undefined bytes in Python's mapping tables (e.g. cp857).
+    # Use replacement so generation is total and deterministic.
+    # Decode all 256 bytes in one call; every single-byte codec yields exactly one char per byte.
+    decoded = bytes(range(256)).decode(py_codec, errors="replace")
+    assert len(decoded) == 256
+    cps = list(map(ord, decoded))
 
-        s = bytes([b]).decode(py_codec, errors="replace")
-        assert len(s) == 1
-        out.append(ord(s))
-    return out
+    # Only apply the PC OEM control-glyph convention to DOS/OEM "cp*" encodings.
+    # Do NOT apply it to ISO-8859-* style encodings (e.g. latin-1 for Amiga).
+    if py_codec.startswith("cp"):
+        return [cp if ov < 0 else ov for cp, ov in zip(cps, _PC_OEM_OVERRIDE)]
+    return cps
 
 
-_MAP_LINE_RE = re.compile(r"^\s*0x([0-9A-Fa-f]{2})\s+0x([0-9A-Fa-f]{4,6})\b")
+_MAP_LINE_RE = re.compile(r"^\s*0x([0-9A-Fa-f]{2})\s+0x([0-9A-Fa-f]{4,6})\b", re.ASCII)
 
 
 def table_from_mapping_file(map_path: Path) -> list[int]:
@@ -144,41 +146,43 @@ def table_from_mapping_file(map_path: Path) -> list[int]:
     return tbl
 
 
-def patch_amiga_latin1(tbl: list[int]) -> list[int]:
-    # Amiga Topaz "house" glyph: traditionally shown at byte 0x7F, where ISO-8859-1 would
-    # normally be DEL (U+007F). Patch the Unicode representative to U+2302 (HOUSE).
+def _apply_amiga_house(tbl: list[int]) -> list[int]:
+    # Amiga Topaz "house" glyph: many Amiga bitmap fonts (Topaz lineage) draw it at byte 0x7F,
+    # where ISO-8859-* defines DEL (U+007F). Patch the Unicode representative to U+2302 (HOUSE).
     #
     # This keeps round-trip behavior sane for tools/UI that want to show that glyph.
-    if len(tbl) == 256:
-        tbl = list(tbl)
-        tbl[0x7F] = 0x2302
-    return tbl
-
-
-def patch_amiga_house_at_7f(tbl: list[int]) -> list[int]:
-    # Many Amiga bitmap fonts (Topaz lineage) draw a "house" glyph at 0x7F, where ISO-8859-*
-    # defines DEL (U+007F). Patch the Unicode representative to U+2302 (HOUSE).
-    if len(tbl) == 256:
-        tbl = list(tbl)
-        tbl[0x7F] = 0x2302
+    # Patches in place: table_for / table_from_mapping_file return fresh lists.
+    tbl[0x7F] = 0x2302
     return tbl
 
 
-def _cpp_char32(cp: int) -> str:
-    # Prefer explicit hex codepoint constants (avoids escaping issues in generated code).
-    return f"(char32_t)0x{cp:04X}" if cp <= 0xFFFF else f"(char32_t)0x{cp:X}"
+# Prefer explicit hex codepoint constants (avoids escaping issues in generated code).
+# "04X" is a minimum width, so non-BMP codepoints still print in full.
+_CPP_CHAR32_PREFIX = "(char32_t)0x"
 
 
-def emit_cpp(name: str, tbl: list[int]) -> str:
-    items = [_cpp_char32(cp) for cp in tbl]
-    lines = []
-    lines.append(f"static constexpr char32_t k{name}[256] = {{")
+def emit_cpp(name: str, tbl: list[int]) -> bytes:
+    items = [_CPP_CHAR32_PREFIX + format(cp, "04X") for cp in tbl]
+    lines = [f"static constexpr char32_t k{name}[256] = {{"]
     # 16 entries per line for readability.
-    for i in range(0, 256, 16):
-        chunk = ", ".join(items[i : i + 16])
-        lines.append(f"    {chunk},")
+    lines.extend(f"    {', '.join(items[i : i + 16])}," for i in range(0, 256, 16))
     lines.append("};")
-    return "\n".join(lines) + "\n"
+    # Generated C++ is pure ASCII, so callers can write the bytes as-is.
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+
+def build_table(spec: EncodingSpec) -> list[int]:
+    if spec.py_codec:
+        tbl = table_for(spec.py_codec)
+    elif spec.mapping_file:
+        tbl = table_from_mapping_file(_REPO_ROOT / spec.mapping_file)
+    else:
+        raise ValueError(f"Invalid EncodingSpec: {spec!r}")
+
+    if spec.cpp_name in ("AmigaLatin1", "AmigaIso8859_15", "AmigaIso8859_2"):
+        _apply_amiga_house(tbl)
+    return tbl
+
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
@@ -189,32 +193,20 @@ if __name__ == "__main__":
     )
     args = ap.parse_args()
 
-    out_s = []
-    out_s.append("// Generated by generate-maps.py")
-    out_s.append("#pragma once")
-    out_s.append("#include <cstdint>")
-    out_s.append("")
-    out_s.append("namespace phos::encodings {")
-    out_s.append("")
+    buf = io.BytesIO()
+    w = buf.write
+    w(b"// Generated by generate-maps.py\n#pragma once\n#include <cstdint>\n\nnamespace phos::encodings {\n\n")
     for spec in ENCODINGS:
-        if spec.py_codec:
-            tbl = table_for(spec.py_codec)
-        elif spec.mapping_file:
-            tbl = table_from_mapping_file(_REPO_ROOT / spec.mapping_file)
-        else:
-            raise ValueError(f"Invalid EncodingSpec: {spec!r}")
-
-        if spec.cpp_name == "AmigaLatin1":
-            tbl = patch_amiga_latin1(tbl)
-        elif spec.cpp_name in ("AmigaIso8859_15", "AmigaIso8859_2"):
-            tbl = patch_amiga_house_at_7f(tbl)
-        out_s.append(emit_cpp(spec.cpp_name, tbl))
-    out_s.append("} // namespace phos::encodings")
-    out_s.append("")
-
-    text = "\n".join(out_s)
+        w(emit_cpp(spec.cpp_name, build_table(spec)))
+        w(b"\n")
+    w(b"} // namespace phos::encodings\n")
+
+    # Write the accumulated bytes directly, skipping the TextIOWrapper
+    # encode/newline-translation layer.
+    data = buf.getvalue()
     if args.out:
-        with open(args.out, "w", encoding="utf-8") as f:
-            f.write(text)
+        Path(args.out).write_bytes(data)
     else:
-        sys.stdout.write(text)
\ No newline at end of file
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()